@@ -27,20 +27,43 @@ __copyright__ = "Copyright 2025, Paul Gierz"
 __email__ = "paul.gierz@awi.de"
 __license__ = "MIT"
 
+import collections
+import hashlib
+import io
+import json
 import os
 import re
-import subprocess
+import stat
 import sys
-import warnings
 from enum import Enum
 from pathlib import Path
-from typing import Dict, Optional, Union
+from typing import Dict, Iterable, Optional, Tuple, Union
 
-try:
-    import herrkunft as yaml
-except ImportError:
-    # Fallback to PyYAML if herrkunft not available
-    import yaml
+# Lines stripped from .run scripts: SLURM directives, SGE/PBS directives
+# (just in case) and sbatch submission commands
+_SKIP_RE = re.compile(r"^\s*(?:#SBATCH|#\$)|.*sbatch\s+.*\.run")
+
+# Number and unit of a memory specification, e.g. "200G"
+_MEM_RE = re.compile(r"([0-9.]+)\s*([KMGT]?B?)")
+
+# Megabytes per memory unit, keyed by the first character of the unit
+_MEM_MULT = {"": 1.0, "K": 1 / 1024, "M": 1.0, "G": 1024.0, "T": 1048576.0}
+
+# Persistent cache of extracted resources, relative to the Snakemake workdir
+RESOURCES_CACHE_FILE = Path(".snakemake") / "esm_resources_cache.json"
+
+# In-process cache of extracted resources, keyed like the persistent cache
+_RESOURCES_MEMO: Dict[str, Dict[str, Union[int, str]]] = {}
+
+# Top-level finished_config.yaml sections read by _extract_resources_from_config
+_RESOURCE_SECTIONS = ("general", "computer")
+
+# YAML backend and loader, imported on first use by _get_yaml()
+_yaml = None
+_SafeLoader = None
+
+# Loader class for pre-parsed events, built by _get_event_list_loader()
+_EventListLoader = None
 
 
 class Task(str, Enum):
@@ -108,6 +131,16 @@ def get_resources(
     ValueError
         If finished_config.yaml cannot be parsed
 
+    Notes
+    -----
+    All tasks of an experiment share one finished_config.yaml, so a cached
+    result for one task is reused for the others. Use
+    :func:`get_all_resources` to declare resources for several tasks at once.
+
+    Results are cached in-process and in ``.snakemake/esm_resources_cache.json``,
+    keyed on the arguments and on the modification times of the runscript and
+    ``modify_config``. Editing either file triggers a fresh ``--check`` run.
+
     Examples
     --------
     Basic usage with string paths::
@@ -128,42 +161,272 @@ def get_resources(
             base_dir="/path/to/experiments"
         )
     """
-    # Validate runscript exists
-    runscript_path = Path(runscript).resolve()
-    if not runscript_path.exists():
-        raise FileNotFoundError(f"Runscript not found: {runscript}")
-
     # Convert task to string if it's an Enum
     task_str = task.value if isinstance(task, Task) else str(task)
 
+    cache_key = _check_cache_key(
+        runscript, expid, modify_config, base_dir, extra_args
+    )
+
+    return dict(_cached_resources(cache_key, task_str))
+
+
+def get_all_resources(
+    runscript: Union[str, Path],
+    tasks: Iterable[Union[str, Task]] = tuple(Task),
+    expid: str = "test",
+    modify_config: Optional[Union[str, Path]] = None,
+    base_dir: Optional[Union[str, Path]] = None,
+    **extra_args,
+) -> Dict[str, Dict[str, Union[int, str]]]:
+    """
+    Extract Snakemake resources for several tasks at once.
+
+    All tasks of an experiment share the same finished_config.yaml, so
+    esm_runscripts --check is run at most once (for the first task) and the
+    result is reused for the remaining ones. This is the preferred way to
+    declare resources for a whole workflow in a Snakefile.
+
+    Parameters
+    ----------
+    runscript : str or Path
+        Path to ESM runscript YAML file
+    tasks : iterable of str or Task, default=all tasks
+        Phases to extract resources for
+    expid : str, default="test"
+        Experiment ID
+    modify_config : str or Path, optional
+        Path to config override file
+    base_dir : str or Path, optional
+        Base directory for experiment (default: current directory)
+    **extra_args
+        Additional arguments passed to esm_runscripts
+
+    Returns
+    -------
+    dict
+        Mapping of task name to the resources dictionary described in
+        :func:`get_resources`
+
+    Raises
+    ------
+    FileNotFoundError
+        If runscript doesn't exist
+    subprocess.CalledProcessError
+        If esm_runscripts --check fails
+    ValueError
+        If finished_config.yaml cannot be parsed
+
+    Examples
+    --------
+    In a Snakefile::
+
+        ALL_RESOURCES = get_all_resources("awicm.yaml", expid="exp001")
+
+        rule compute:
+            resources:
+                **ALL_RESOURCES["compute"]
+    """
+    task_strs = [t.value if isinstance(t, Task) else str(t) for t in tasks]
+    if not task_strs:
+        return {}
+
+    cache_key = _check_cache_key(
+        runscript, expid, modify_config, base_dir, extra_args
+    )
+    resources = _cached_resources(cache_key, task_strs[0])
+
+    return {task_str: dict(resources) for task_str in task_strs}
+
+
+def _check_cache_key(
+    runscript: Union[str, Path],
+    expid: str,
+    modify_config: Optional[Union[str, Path]],
+    base_dir: Optional[Union[str, Path]],
+    extra_args: dict,
+) -> tuple:
+    """
+    Validate the get_resources arguments and build the cache key.
+
+    The key covers everything that can change the generated
+    finished_config.yaml, including the modification times of the runscript
+    and of ``modify_config`` so that edits to either invalidate it.
+
+    Returns
+    -------
+    tuple
+        ``(runscript, runscript_mtime, expid, modify_config, modify_mtime,
+        cwd, extra_args)``, with all values JSON-serializable
+
+    Raises
+    ------
+    FileNotFoundError
+        If runscript or base_dir doesn't exist
+    NotADirectoryError
+        If base_dir is not a directory
+    """
+    # A single stat per path both validates it and provides the mtime.
+    # os.path.abspath is pure string manipulation, unlike Path.resolve().
+    try:
+        runscript_stat = os.stat(runscript)
+    except (FileNotFoundError, NotADirectoryError):
+        raise FileNotFoundError(f"Runscript not found: {runscript}") from None
+    runscript_path = os.path.abspath(runscript)
+
     # Validate and convert base_dir
     if base_dir is not None:
-        base_dir_path = Path(base_dir).resolve()
-        if not base_dir_path.exists():
-            raise FileNotFoundError(f"Base directory not found: {base_dir}")
-        if not base_dir_path.is_dir():
+        try:
+            base_dir_stat = os.stat(base_dir)
+        except (FileNotFoundError, NotADirectoryError):
+            raise FileNotFoundError(f"Base directory not found: {base_dir}") from None
+        if not stat.S_ISDIR(base_dir_stat.st_mode):
             raise NotADirectoryError(f"Base directory is not a directory: {base_dir}")
-        cwd = str(base_dir_path)
+        cwd = os.path.abspath(base_dir)
     else:
         cwd = os.getcwd()
 
+    modify_mtime = None
+    if modify_config:
+        try:
+            modify_mtime = (Path(cwd) / modify_config).stat().st_mtime_ns
+        except (FileNotFoundError, NotADirectoryError):
+            pass
+
+    return (
+        runscript_path,
+        runscript_stat.st_mtime_ns,
+        expid,
+        str(modify_config) if modify_config else None,
+        modify_mtime,
+        cwd,
+        tuple((key, str(value)) for key, value in extra_args.items()),
+    )
+
+
+def _cached_resources(cache_key: tuple, task: str) -> Dict[str, Union[int, str]]:
+    """
+    Return resources for ``cache_key``, running esm_runscripts only on a miss.
+
+    Results are memoized in-process and persisted to
+    ``.snakemake/esm_resources_cache.json`` so that the repeated Snakefile
+    evaluations of a Snakemake session share a single ``--check`` run.
+
+    Parameters
+    ----------
+    cache_key : tuple
+        Key built by :func:`_check_cache_key`
+    task : str
+        Task passed to esm_runscripts --check on a cache miss
+
+    Returns
+    -------
+    dict
+        Dictionary with Snakemake resource specifications
+    """
+    digest = hashlib.sha1(json.dumps(cache_key).encode("utf-8")).hexdigest()
+
+    if digest in _RESOURCES_MEMO:
+        return _RESOURCES_MEMO[digest]
+
+    disk_cache = _read_resources_cache()
+    if digest in disk_cache:
+        resources = disk_cache[digest]["resources"]
+        print(f"Using cached resources: {resources}", file=sys.stderr)
+    else:
+        config = _load_finished_config(cache_key, task)
+        resources = _extract_resources_from_config(config)
+        print(f"Extracted resources: {resources}", file=sys.stderr)
+
+        # Entries for the same experiment are outdated by this one
+        runscript_path, _, expid, _, _, cwd, _ = cache_key
+        source = [runscript_path, expid, cwd]
+        disk_cache = {
+            key: entry
+            for key, entry in disk_cache.items()
+            if entry["source"] != source
+        }
+        disk_cache[digest] = {"source": source, "resources": resources}
+        _write_resources_cache(disk_cache)
+
+    _RESOURCES_MEMO[digest] = resources
+    return resources
+
+
+def _load_finished_config(cache_key: tuple, task: str) -> dict:
+    """
+    Run esm_runscripts --check and load the resulting finished_config.yaml.
+
+    The subprocess is skipped if the existing finished_config.yaml is still
+    up to date, see :func:`_is_config_reusable`. After a ``--check`` run, an
+    arguments sidecar is written next to the config to allow that.
+
+    Parameters
+    ----------
+    cache_key : tuple
+        Key built by :func:`_check_cache_key`
+    task : str
+        Task/phase name passed to esm_runscripts
+
+    Returns
+    -------
+    dict
+        The resource sections of finished_config.yaml, see
+        :func:`_load_resource_sections`
+
+    Raises
+    ------
+    subprocess.CalledProcessError
+        If esm_runscripts --check fails
+    FileNotFoundError
+        If finished_config.yaml cannot be found
+    """
+    (
+        runscript_path,
+        runscript_mtime,
+        expid,
+        modify_config,
+        modify_mtime,
+        cwd,
+        extra_args,
+    ) = cache_key
+
+    args = [runscript_path, expid, modify_config, cwd, extra_args]
+    args_digest = hashlib.sha1(json.dumps(args).encode("utf-8")).hexdigest()
+
+    # Reuse an existing finished_config.yaml if it is still up to date
+    try:
+        config_path, n_matches = _scan_finished_config(expid, cwd)
+    except FileNotFoundError:
+        config_path = None
+
+    if config_path is not None and _is_config_reusable(
+        config_path, args_digest, runscript_mtime, modify_config, modify_mtime
+    ):
+        if n_matches > 1:
+            _warn_multiple_configs(expid, n_matches)
+        print(f"Reusing up-to-date {config_path}", file=sys.stderr)
+        return _load_resource_sections(config_path)
+
+    import subprocess
+
     # Build command
     cmd = [
         "esm_runscripts",
         "--check",
-        str(runscript_path),
+        runscript_path,
         "-t",
-        task_str,
+        task,
         "-e",
         expid,
     ]
 
     if modify_config:
-        cmd.extend(["-m", str(modify_config)])
+        cmd.extend(["-m", modify_config])
 
     # Add any extra arguments
-    for key, value in extra_args.items():
-        cmd.extend([f"--{key}", str(value)])
+    for key, value in extra_args:
+        cmd.extend([f"--{key}", value])
 
     # Run esm_runscripts --check to generate finished_config.yaml
     print(f"Extracting resources: {' '.join(cmd)}", file=sys.stderr)
@@ -178,17 +441,416 @@ def get_resources(
         raise
 
     # Find and load finished_config.yaml
-    config_path = _find_finished_config(expid, task, base_dir)
+    config_path = _find_finished_config(expid, task, cwd)
+    _write_args_sidecar(config_path, args_digest)
 
-    with open(config_path) as f:
-        config = yaml.safe_load(f)
+    return _load_resource_sections(config_path)
 
-    # Extract and return resources
-    resources = _extract_resources_from_config(config)
 
-    print(f"Extracted resources: {resources}", file=sys.stderr)
+def _args_sidecar_path(config_path: Path) -> Path:
+    """
+    Return the path of the arguments sidecar for a finished_config.yaml.
+    """
+    return config_path.with_name(f"{config_path.name}.snakemake_args.json")
 
-    return resources
+
+def _is_config_reusable(
+    config_path: Path,
+    args_digest: str,
+    runscript_mtime: int,
+    modify_config: Optional[str],
+    modify_mtime: Optional[int],
+) -> bool:
+    """
+    Check whether a finished_config.yaml can be used without a new --check.
+
+    This is the case if its arguments sidecar shows it was generated by
+    :func:`get_resources` with the same arguments, it has not been modified
+    since, and it is newer than both the runscript and ``modify_config``.
+    Configs without a sidecar, e.g. written by the wrapper or a manual
+    esm_runscripts call, are never reused.
+
+    Parameters
+    ----------
+    config_path : Path
+        Path to finished_config.yaml
+    args_digest : str
+        Digest of the esm_runscripts arguments of the current call
+    runscript_mtime : int
+        Modification time of the runscript, in nanoseconds
+    modify_config : str, optional
+        Path to config override file
+    modify_mtime : int, optional
+        Modification time of ``modify_config``, in nanoseconds
+
+    Returns
+    -------
+    bool
+        Whether the config is up to date for the current arguments
+    """
+    try:
+        config_mtime = config_path.stat().st_mtime_ns
+        with open(_args_sidecar_path(config_path)) as f:
+            sidecar = json.load(f)
+    except (OSError, ValueError):
+        return False
+
+    if not isinstance(sidecar, dict):
+        return False
+    if sidecar.get("args") != args_digest or sidecar.get("mtime_ns") != config_mtime:
+        return False
+    if config_mtime <= runscript_mtime:
+        return False
+    if modify_config:
+        return modify_mtime is not None and config_mtime > modify_mtime
+    return True
+
+
+def _write_args_sidecar(config_path: Path, args_digest: str):
+    """
+    Record the arguments a finished_config.yaml was generated with.
+
+    Failures are ignored, since the sidecar is only an optimization.
+
+    Parameters
+    ----------
+    config_path : Path
+        Path to finished_config.yaml
+    args_digest : str
+        Digest of the esm_runscripts arguments it was generated with
+    """
+    try:
+        sidecar = {"args": args_digest, "mtime_ns": config_path.stat().st_mtime_ns}
+        with open(_args_sidecar_path(config_path), "w") as f:
+            json.dump(sidecar, f)
+    except OSError as e:
+        print(f"Could not write config arguments sidecar: {e}", file=sys.stderr)
+
+
+def _read_resources_cache() -> dict:
+    """
+    Read the on-disk resources cache.
+
+    Returns
+    -------
+    dict
+        Mapping of cache key digests to entries holding the ``source``
+        ``[runscript, expid, cwd]`` and the extracted ``resources``. Empty if
+        the cache file does not exist or cannot be read; malformed entries
+        are dropped.
+    """
+    try:
+        with open(RESOURCES_CACHE_FILE) as f:
+            disk_cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+    if not isinstance(disk_cache, dict):
+        return {}
+
+    return {
+        key: entry
+        for key, entry in disk_cache.items()
+        if isinstance(entry, dict) and "source" in entry and "resources" in entry
+    }
+
+
+def _write_resources_cache(disk_cache: dict):
+    """
+    Write the on-disk resources cache.
+
+    The file is replaced atomically so that concurrent Snakemake processes
+    never read a partially written cache. Failures are ignored, since the
+    cache is only an optimization.
+
+    Parameters
+    ----------
+    disk_cache : dict
+        Mapping of cache key digests to entries, see
+        :func:`_read_resources_cache`
+    """
+    tmp_path = RESOURCES_CACHE_FILE.with_name(
+        f"{RESOURCES_CACHE_FILE.name}.{os.getpid()}.tmp"
+    )
+    try:
+        RESOURCES_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp_path, "w") as f:
+            json.dump(disk_cache, f)
+        os.replace(tmp_path, RESOURCES_CACHE_FILE)
+    except (OSError, TypeError, ValueError) as e:
+        print(f"Could not write resources cache: {e}", file=sys.stderr)
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+
+
+def _get_yaml():
+    """
+    Import the YAML backend on first use.
+
+    The import is deferred so that Snakefiles whose resources are served
+    from the cache never pay for it. herrkunft is preferred; otherwise
+    PyYAML is used with ``CSafeLoader`` if libyaml is available.
+
+    Returns
+    -------
+    module
+        herrkunft or yaml
+    """
+    global _yaml, _SafeLoader
+
+    if _yaml is None:
+        try:
+            import herrkunft as yaml
+        except ImportError:
+            # Fallback to PyYAML if herrkunft not available
+            import yaml
+
+            # Prefer the libyaml-backed loader; the pure-Python one is much slower
+            try:
+                from yaml import CSafeLoader as _SafeLoader
+            except ImportError:
+                from yaml import SafeLoader as _SafeLoader
+        _yaml = yaml
+
+    return _yaml
+
+
+def _load_yaml(config_path: Path) -> dict:
+    """
+    Load a YAML file with the fastest available loader.
+
+    herrkunft is used as-is when installed (for its provenance tracking).
+    Otherwise PyYAML's ``CSafeLoader`` is used, falling back to the
+    pure-Python ``SafeLoader`` if libyaml is not available.
+
+    Parameters
+    ----------
+    config_path : Path
+        Path to the YAML file
+
+    Returns
+    -------
+    dict
+        Parsed YAML content
+    """
+    yaml = _get_yaml()
+
+    if _SafeLoader is None:
+        with open(config_path) as f:
+            return yaml.safe_load(f)
+
+    # Binary mode lets libyaml handle the decoding itself
+    with open(config_path, "rb") as f:
+        return yaml.load(f, Loader=_SafeLoader)
+
+
+def _load_resource_sections(config_path: Path) -> dict:
+    """
+    Load only the resource-relevant top-level sections of a YAML file.
+
+    A finished_config.yaml holds the full configuration of every model
+    component, but only the sections in ``_RESOURCE_SECTIONS`` are needed.
+    With PyYAML, the document is walked as an event stream: only those
+    sections are composed and constructed, everything else is skipped, and
+    parsing stops once all of them have been read. The whole file is loaded
+    instead when herrkunft is in use, when the document is not a mapping,
+    or when a wanted section contains aliases.
+
+    Because reading stops early, the file is not fully validated the way
+    ``yaml.safe_load`` validates it:
+
+    - the first occurrence of a duplicated top-level key is used, whereas
+      ``yaml.safe_load`` keeps the last one
+    - syntax errors after the wanted sections go unnoticed
+    - further documents in a multi-document stream are ignored rather than
+      rejected
+    - skipped top-level entries are not constructed, so e.g. unhashable
+      complex keys there are not rejected
+
+    finished_config.yaml is written by a YAML dumper, so none of these occur
+    in practice. Checking for the end of the stream would require parsing
+    the whole file and defeat the purpose.
+
+    Parameters
+    ----------
+    config_path : Path
+        Path to the YAML file
+
+    Returns
+    -------
+    dict
+        Mapping of the found section names to their content
+    """
+    yaml = _get_yaml()
+
+    if _SafeLoader is None:
+        return _load_yaml(config_path)
+
+    print(
+        f"Parsing {config_path} with yaml.{_SafeLoader.__name__}", file=sys.stderr
+    )
+
+    sections = {}
+
+    # Binary mode lets libyaml handle the decoding itself
+    with open(config_path, "rb") as f:
+        loader = _SafeLoader(f)
+        try:
+            loader.get_event()  # StreamStartEvent
+            if not loader.check_event(yaml.DocumentStartEvent):
+                # Empty document
+                return sections
+            loader.get_event()
+
+            if not loader.check_event(yaml.MappingStartEvent):
+                return _load_yaml(config_path)
+            loader.get_event()
+
+            while not loader.check_event(yaml.MappingEndEvent):
+                key_events = list(_iter_node_events(loader, yaml))
+                key = key_events[0]
+                if (
+                    len(key_events) == 1
+                    and isinstance(key, yaml.ScalarEvent)
+                    and key.value in _RESOURCE_SECTIONS
+                    and key.value not in sections
+                ):
+                    value_events = list(_iter_node_events(loader, yaml))
+                    if any(isinstance(e, yaml.AliasEvent) for e in value_events):
+                        return _load_yaml(config_path)
+                    sections[key.value] = _construct_from_events(value_events, yaml)
+
+                    if len(sections) == len(_RESOURCE_SECTIONS):
+                        break
+                else:
+                    for _ in _iter_node_events(loader, yaml):
+                        pass
+        finally:
+            loader.dispose()
+
+    return sections
+
+
+def _iter_node_events(loader, yaml):
+    """
+    Consume and yield the parser events making up the next YAML node.
+
+    Parameters
+    ----------
+    loader : yaml.SafeLoader or yaml.CSafeLoader
+        Loader positioned at the start of a node
+    yaml : module
+        The PyYAML module
+
+    Yields
+    ------
+    yaml.Event
+        Events of the node, from its start to its matching end event
+    """
+    depth = 0
+    while True:
+        event = loader.get_event()
+        yield event
+        if isinstance(event, (yaml.MappingStartEvent, yaml.SequenceStartEvent)):
+            depth += 1
+        elif isinstance(event, (yaml.MappingEndEvent, yaml.SequenceEndEvent)):
+            depth -= 1
+        if depth == 0:
+            return
+
+
+def _construct_from_events(events: list, yaml):
+    """
+    Construct the Python object for a node from its parser events.
+
+    Parameters
+    ----------
+    events : list
+        Events of a single node, as yielded by :func:`_iter_node_events`
+    yaml : module
+        The PyYAML module
+
+    Returns
+    -------
+    object
+        The constructed value, with the same tag resolution as
+        ``yaml.safe_load``
+    """
+
+    loader = _get_event_list_loader(yaml)(events)
+    return loader.construct_document(loader.compose_node(None, None))
+
+
+def _get_event_list_loader(yaml):
+    """
+    Build the loader class used by :func:`_construct_from_events` on first use.
+
+    The class needs PyYAML's Composer, SafeConstructor and Resolver, so it
+    cannot be defined before the YAML backend has been imported.
+
+    Parameters
+    ----------
+    yaml : module
+        The PyYAML module
+
+    Returns
+    -------
+    type
+        Loader class that composes and constructs a node from an event list
+    """
+    global _EventListLoader
+
+    if _EventListLoader is None:
+
+        class EventListLoader(
+            yaml.composer.Composer,
+            yaml.constructor.SafeConstructor,
+            yaml.resolver.Resolver,
+        ):
+            def __init__(self, events):
+                self._events = collections.deque(events)
+                yaml.composer.Composer.__init__(self)
+                yaml.constructor.SafeConstructor.__init__(self)
+                yaml.resolver.Resolver.__init__(self)
+
+            def check_event(self, *choices):
+                if not self._events:
+                    return False
+                return not choices or isinstance(self._events[0], choices)
+
+            def peek_event(self):
+                return self._events[0]
+
+            def get_event(self):
+                return self._events.popleft()
+
+        _EventListLoader = EventListLoader
+
+    return _EventListLoader
+
+
+def _external_stacklevel() -> int:
+    """
+    Return the ``stacklevel`` that attributes a warning to user code.
+
+    Warnings raised in this module should point at the Snakefile line that
+    called :func:`get_resources` or :func:`get_all_resources`, however many
+    internal (caching) layers are in between.
+
+    Returns
+    -------
+    int
+        ``stacklevel`` for a ``warnings.warn`` call made directly in the
+        function that calls this one
+    """
+    frame = sys._getframe(1)
+    level = 1
+    while frame is not None and frame.f_globals is globals():
+        frame = frame.f_back
+        level += 1
+    return level
 
 
 def _find_finished_config(
@@ -211,6 +873,51 @@ def _find_finished_config(
     Path
         Path to finished_config.yaml
 
+    Raises
+    ------
+    FileNotFoundError
+        If config file cannot be found
+    """
+    config_path, n_matches = _scan_finished_config(expid, base_dir)
+    if n_matches > 1:
+        _warn_multiple_configs(expid, n_matches)
+    return config_path
+
+
+def _warn_multiple_configs(expid: str, n_matches: int):
+    """
+    Warn that several finished_config.yaml files matched for ``expid``.
+    """
+    import warnings
+
+    warnings.warn(
+        f"Found {n_matches} finished_config.yaml files for expid={expid}. "
+        f"Using the most recently modified one. This may not be correct if you "
+        f"have been manually examining or modifying these files.",
+        UserWarning,
+        stacklevel=_external_stacklevel(),
+    )
+
+
+def _scan_finished_config(
+    expid: str, base_dir: Optional[str] = None
+) -> Tuple[Path, int]:
+    """
+    Search for finished_config.yaml without warning about ambiguities.
+
+    Parameters
+    ----------
+    expid : str
+        Experiment ID
+    base_dir : str, optional
+        Optional base directory to search
+
+    Returns
+    -------
+    tuple
+        Path to finished_config.yaml and the number of candidate files it
+        was chosen from (1 for an exact match)
+
     Raises
     ------
     FileNotFoundError
@@ -230,30 +937,32 @@ def _find_finished_config(
         search_dir,
     ]
 
+    prefix = f"{expid}_"
+    exact_name = f"{expid}_finished_config.yaml"
+
     for search_path in search_paths:
-        if not search_path.exists():
+        # A single directory scan; stat results are cached on the DirEntry
+        try:
+            with os.scandir(search_path) as it:
+                matches = [
+                    entry
+                    for entry in it
+                    if entry.name.startswith(prefix)
+                    and entry.name.endswith("finished_config.yaml")
+                ]
+        except (FileNotFoundError, NotADirectoryError):
             continue
 
         # Try exact match first
-        exact_match = search_path / f"{expid}_finished_config.yaml"
-        if exact_match.exists():
-            return exact_match
-
-        # Try pattern match (for coupled models)
-        pattern = f"{expid}_*finished_config.yaml"
-        matches = list(search_path.glob(pattern))
+        for entry in matches:
+            if entry.name == exact_name:
+                return Path(entry.path), 1
 
+        # Otherwise use the pattern matches (for coupled models)
         if matches:
             # Return the most recent one
-            if len(matches) > 1:
-                warnings.warn(
-                    f"Found {len(matches)} finished_config.yaml files for expid={expid}. "
-                    f"Using the most recently modified one. This may not be correct if you "
-                    f"have been manually examining or modifying these files.",
-                    UserWarning,
-                    stacklevel=3
-                )
-            return max(matches, key=lambda p: p.stat().st_mtime)
+            most_recent = max(matches, key=lambda e: e.stat().st_mtime_ns)
+            return Path(most_recent.path), len(matches)
 
     # Build list of searched paths for error message
     searched_paths = "\n  ".join(str(p) for p in search_paths)
@@ -343,7 +1052,7 @@ def _parse_memory(mem_str: str) -> int:
     mem_str = str(mem_str).strip().upper()
 
     # Match number and unit
-    match = re.match(r"([0-9.]+)\s*([KMGT]?B?)", mem_str)
+    match = _MEM_RE.match(mem_str)
     if not match:
         raise ValueError(f"Cannot parse memory: {mem_str}")
 
@@ -351,18 +1060,16 @@ def _parse_memory(mem_str: str) -> int:
     unit = match.group(2)
 
     # Convert to MB
-    if unit.startswith("K"):
-        # Round up to at least 1 MB
-        mb_value = value / 1024
+    try:
+        multiplier = _MEM_MULT[unit[:1]]
+    except KeyError:
+        raise ValueError(f"Unknown memory unit: {unit}") from None
+
+    mb_value = value * multiplier
+    if multiplier < 1:
+        # Round sub-MB units, with at least 1 MB
         return max(1, int(mb_value + 0.5))
-    elif unit.startswith("M") or not unit:
-        return int(value)
-    elif unit.startswith("G"):
-        return int(value * 1024)
-    elif unit.startswith("T"):
-        return int(value * 1024 * 1024)
-    else:
-        raise ValueError(f"Unknown memory unit: {unit}")
+    return int(mb_value)
 
 
 def _parse_time(time_str: str) -> int:
@@ -393,23 +1100,28 @@ def _parse_time(time_str: str) -> int:
 
     time_str = str(time_str).strip()
 
-    # Try parsing as integer (already in minutes)
-    try:
+    # Plain integer, already in minutes (the common case)
+    if time_str.isdecimal():
         return int(time_str)
-    except ValueError:
-        pass
 
     # Parse HH:MM:SS or MM:SS format
-    parts = time_str.split(":")
-
-    if len(parts) == 3:
-        hours, minutes, seconds = map(int, parts)
-        return hours * 60 + minutes + (1 if seconds > 0 else 0)
-    elif len(parts) == 2:
-        minutes, seconds = map(int, parts)
-        return minutes + (1 if seconds > 0 else 0)
+    first, sep, rest = time_str.partition(":")
+    if not sep:
+        # Less common integer forms such as "+720"
+        try:
+            return int(time_str)
+        except ValueError:
+            raise ValueError(f"Cannot parse time: {time_str}") from None
+
+    second, sep, seconds = rest.partition(":")
+    if sep:
+        if ":" in seconds:
+            raise ValueError(f"Cannot parse time: {time_str}")
+        hours, minutes = int(first), int(second)
     else:
-        raise ValueError(f"Cannot parse time: {time_str}")
+        hours, minutes, seconds = 0, int(first), second
+
+    return hours * 60 + minutes + (1 if int(seconds) > 0 else 0)
 
 
 # Wrapper execution functions
@@ -450,19 +1162,25 @@ def find_run_script(expid: str, task: str, base_dir: Path = None) -> Path:
         search_dir,
     ]
 
-    for search_path in search_paths:
-        if not search_path.exists():
-            continue
+    prefix = f"{expid}_"
 
+    for search_path in search_paths:
         # Pattern: {expid}_*.run
         # Find the most recent one matching the pattern
-        pattern = f"{expid}_*.run"
-        matches = list(search_path.glob(pattern))
+        try:
+            with os.scandir(search_path) as it:
+                matches = [
+                    entry
+                    for entry in it
+                    if entry.name.startswith(prefix) and entry.name.endswith(".run")
+                ]
+        except (FileNotFoundError, NotADirectoryError):
+            continue
 
         if matches:
             # Return the most recent one
-            most_recent = max(matches, key=lambda p: p.stat().st_mtime)
-            return most_recent
+            most_recent = max(matches, key=lambda e: e.stat().st_mtime_ns)
+            return Path(most_recent.path)
 
     raise FileNotFoundError(
         f"Could not find .run script for expid={expid} in {search_dir}"
@@ -491,24 +1209,12 @@ def extract_executable_content(run_script_path: Path) -> str:
     str
         Executable shell script content as string
     """
+    # Stream the file so that only the kept lines are held in memory
+    buf = io.StringIO()
     with open(run_script_path) as f:
-        lines = f.readlines()
-
-    executable_lines = []
-    skip_patterns = [
-        r"^\s*#SBATCH",  # SLURM directives
-        r"^\s*#\$",  # SGE/PBS directives (just in case)
-        r".*sbatch\s+.*\.run",  # sbatch submission commands
-    ]
-
-    for line in lines:
-        # Check if line should be skipped
-        should_skip = any(re.match(pattern, line) for pattern in skip_patterns)
+        buf.writelines(line for line in f if not _SKIP_RE.match(line))
 
-        if not should_skip:
-            executable_lines.append(line)
-
-    content = "".join(executable_lines)
+    content = buf.getvalue()
 
     # Ensure we have content
     if not content.strip():
@@ -527,9 +1233,17 @@ def write_executable_script(content: str, output_path: Path):
         Shell script content
     output_path : Path
         Path where script should be written
+
+    Notes
+    -----
+    The mode is set to 0o755 on the open descriptor with ``os.fchmod``,
+    regardless of the umask and of the mode of an existing file at
+    ``output_path``.
     """
-    with open(output_path, "w") as f:
-        f.write(content)
+    data = content.encode("utf-8")
 
-    # Make executable
-    os.chmod(output_path, 0o755)
+    fd = os.open(output_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o755)
+    with os.fdopen(fd, "wb") as f:
+        # Make executable
+        os.fchmod(f.fileno(), 0o755)
+        f.write(data)